@@ -1,18 +1,43 @@
 import asyncio
-import json
+import atexit
+import logging
 import threading
 import time
-from datetime import datetime
+import uuid
 from flask import Flask, jsonify
+from flask.json.provider import JSONProvider
 import os
 from pathlib import Path
+import orjson
 
 # Import your OxaamAutomation class
-from oxaam_automation import OxaamAutomation
+from oxaam_automation import OxaamAutomation, close_browser, close_http_session
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of str round-tripping
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Send scraper progress from the 'oxaam' logger to stderr as it happens;
+# basicConfig does nothing if the server (e.g. gunicorn) already configured logging
+logging.basicConfig(format='%(message)s')
+logging.getLogger('oxaam').setLevel(logging.INFO)
 
-# Global variables to track scraping status
+# Global variables to track scraping status.
+# Both dicts are treated as immutable snapshots: writers build a new dict and
+# rebind the global (atomic under the GIL), readers just grab the reference.
 scraping_status = {
     "is_running": False,
     "started_at": None,
@@ -33,30 +58,187 @@ latest_results = {
     "timestamp": None
 }
 
-# History of all scraping sessions
-scraping_history = []
-history_file = "oxaam_scraping_history.json"
+# History of all scraping sessions (one JSON object per line, append-only)
+history_file = "oxaam_scraping_history.ndjson"
+# Single JSON array written by older versions, still read if present
+legacy_history_file = "oxaam_scraping_history.json"
+
+def iter_history():
+    """Lazily yield history sessions, legacy JSON array first, then the NDJSON file"""
+    if Path(legacy_history_file).exists():
+        try:
+            with open(legacy_history_file, 'rb') as f:
+                legacy_sessions = orjson.loads(f.read())
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load legacy history: {str(e)}")
+        else:
+            yield from legacy_sessions
+    if not Path(history_file).exists():
+        return
+    
+    # A torn or corrupt line (e.g. cut short by a crash) is skipped on its own
+    # instead of discarding every session around it
+    skipped = 0
+    with open(history_file, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                session = orjson.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if isinstance(session, dict):
+                yield session
+            else:
+                skipped += 1
+    if skipped:
+        print(f"⚠️  Skipped {skipped} unreadable history line(s) in {history_file}")
+
+# Aggregates served by /logs, kept up to date incrementally
+history_index = {
+    "total_sessions": 0,
+    "total_accounts_all_time": 0,
+    "sorted_desc": []
+}
+history_lock = threading.Lock()
 
 def load_history():
-    """Load scraping history from file"""
-    global scraping_history
+    """Load scraping history from file and build the /logs aggregates once"""
     try:
-        if Path(history_file).exists():
-            with open(history_file, 'r') as f:
-                scraping_history = json.load(f)
+        sessions = list(iter_history())
     except Exception as e:
         print(f"⚠️  Could not load history: {str(e)}")
-        scraping_history = []
+        sessions = []
+    
+    sessions.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+    with history_lock:
+        history_index["total_sessions"] = len(sessions)
+        history_index["total_accounts_all_time"] = sum(session.get("total_accounts", 0) for session in sessions)
+        history_index["sorted_desc"] = sessions
+
+# Long-lived append handle for the history file, opened on the first save
+history_fh = None
+
+def open_history_for_append():
+    """Open the history file for appending, first ending a torn last line"""
+    fh = open(history_file, 'ab', buffering=1024 * 1024)
+    # An OS crash or power loss can leave the last line cut short; start the
+    # next record on a fresh line so it isn't glued onto the torn one
+    if os.path.getsize(history_file) > 0:
+        with open(history_file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                fh.write(b"\n")
+    return fh
 
 def save_to_history(session_data):
-    """Save session data to history"""
-    global scraping_history
-    try:
-        scraping_history.append(session_data)
-        with open(history_file, 'w') as f:
-            json.dump(scraping_history, f, indent=2)
-    except Exception as e:
-        print(f"⚠️  Could not save to history: {str(e)}")
+    """Append session data to history without rewriting older entries"""
+    global history_fh
+    with history_lock:
+        # New sessions are always the newest, so no re-sort is needed
+        history_index["total_sessions"] += 1
+        history_index["total_accounts_all_time"] += session_data.get("total_accounts", 0)
+        history_index["sorted_desc"].insert(0, session_data)
+        
+        try:
+            if history_fh is None:
+                history_fh = open_history_for_append()
+            history_fh.write(orjson.dumps(session_data) + b"\n")
+            # flush hands the line to the OS, so it survives a crash of this process;
+            # without fsync an OS crash or power loss can still tear the last line,
+            # which iter_history skips and open_history_for_append terminates
+            history_fh.flush()
+        except Exception as e:
+            print(f"⚠️  Could not save to history: {str(e)}")
+
+def close_history_file():
+    """Close the history append handle on interpreter exit"""
+    with history_lock:
+        if history_fh is not None:
+            history_fh.close()
+
+atexit.register(close_history_file)
+
+# Per-job status snapshots keyed by job id; scraping_status mirrors the newest job
+jobs = {}
+jobs_lock = threading.Lock()
+latest_job_id = None
+max_tracked_jobs = 100
+
+# How many scrapes may drive a browser at once; extra jobs wait their turn
+max_concurrent_scrapes = int(os.environ.get('MAX_CONCURRENT_SCRAPES', 1))
+# How many more jobs may wait for a free slot before /accounts starts refusing
+max_queued_scrapes = int(os.environ.get('MAX_QUEUED_SCRAPES', 2))
+# Created lazily on scraping_loop, since asyncio primitives bind to a loop
+scrape_semaphore = None
+
+# Persistent event loop that hosts every scraping coroutine, so requests don't
+# pay for creating and tearing down a loop (and a thread) each time
+scraping_loop = asyncio.new_event_loop()
+threading.Thread(target=scraping_loop.run_forever, daemon=True).start()
+
+def close_scraping_resources():
+    """Close the browser and HTTP session shared by scraping jobs on interpreter exit"""
+    for close in (close_browser, close_http_session):
+        try:
+            asyncio.run_coroutine_threadsafe(close(), scraping_loop).result(timeout=10)
+        except Exception as e:
+            print(f"⚠️  Could not run {close.__name__}: {str(e)}")
+
+atexit.register(close_scraping_resources)
+
+def update_job(job_id, **changes):
+    """Publish a new snapshot for job_id with the given fields changed"""
+    global scraping_status
+    with jobs_lock:
+        snapshot = {**jobs[job_id], **changes}
+        jobs[job_id] = snapshot
+        if job_id == latest_job_id:
+            scraping_status = snapshot
+
+# [epoch second, formatted timestamp] so strftime runs at most once per second
+_ts_cache = [0, ""]
+
+def now_str():
+    """Return the current local time formatted as YYYY-mm-dd HH:MM:SS"""
+    t = int(time.time())
+    cache = _ts_cache
+    if cache[0] != t:
+        # Store the string before the key so readers never pair a new key with a stale string
+        cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+        cache[0] = t
+    return cache[1]
+
+# Static payloads are encoded once at import instead of on every request
+_INDEX_BYTES = orjson.dumps({
+    "title": "Oxaam Account Scraper API",
+    "version": "1.0.0",
+    "endpoints": {
+        "/": "API documentation (this page)",
+        "/accounts": "Queue a scraping job and return its job id",
+        "/status": "Check the status of the most recent scraping job",
+        "/status/<job_id>": "Check the status of a specific scraping job",
+        "/result/<job_id>": "Get the accounts scraped by a finished job",
+        "/health": "Health check endpoint",
+        "/latest": "Get the latest scraped results without running a new scrape",
+        "/logs": "View all scraping history from the beginning"
+    },
+    "usage": {
+        "accounts": "GET or POST /accounts to queue a scrape (returns 202 with a job_id, or 429 when the queue is full)",
+        "status": "GET /status or /status/<job_id> to check scraping progress",
+        "result": "GET /result/<job_id> to get the accounts once the job has completed",
+        "health": "GET /health to check if the service is running",
+        "latest": "GET /latest to get the most recent results",
+        "logs": "GET /logs to view all scraping history"
+    }
+})
+
+_HEALTH_TEMPLATE_BYTES = orjson.dumps({
+    "status": "healthy",
+    "timestamp": "{ts}",
+    "uptime": "Service is running"
+})
 
 # Load history on startup
 load_history()
@@ -64,47 +246,30 @@ load_history()
 @app.route('/')
 def index():
     """API documentation endpoint"""
-    return jsonify({
-        "title": "Oxaam Account Scraper API",
-        "version": "1.0.0",
-        "endpoints": {
-            "/": "API documentation (this page)",
-            "/accounts": "Run the scraping process and return accounts in JSON",
-            "/status": "Check the current scraping status",
-            "/health": "Health check endpoint",
-            "/latest": "Get the latest scraped results without running a new scrape",
-            "/logs": "View all scraping history from the beginning"
-        },
-        "usage": {
-            "accounts": "GET /accounts to start scraping and get results",
-            "status": "GET /status to check if scraping is running",
-            "health": "GET /health to check if the service is running",
-            "latest": "GET /latest to get the most recent results",
-            "logs": "GET /logs to view all scraping history"
-        }
-    })
+    return app.response_class(_INDEX_BYTES, mimetype="application/json")
 
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "uptime": "Service is running"
-    })
+    return app.response_class(
+        _HEALTH_TEMPLATE_BYTES.replace(b"{ts}", now_str().encode()),
+        mimetype="application/json"
+    )
 
 @app.route('/status')
 def status():
     """Check scraping progress"""
-    return jsonify(scraping_status)
+    snapshot = scraping_status
+    return jsonify(snapshot)
 
 @app.route('/latest')
 def latest():
     """Get the latest scraped results without running a new scrape"""
-    if latest_results["timestamp"]:
+    snapshot = latest_results
+    if snapshot["timestamp"]:
         return jsonify({
             "status": "success",
-            "data": latest_results,
+            "data": snapshot,
             "message": "Returning latest scraped results"
         })
     else:
@@ -116,7 +281,12 @@ def latest():
 @app.route('/logs')
 def logs():
     """View all scraping history from the beginning"""
-    if not scraping_history:
+    with history_lock:
+        total_sessions = history_index["total_sessions"]
+        total_accounts = history_index["total_accounts_all_time"]
+        sorted_history = list(history_index["sorted_desc"])
+    
+    if not total_sessions:
         return jsonify({
             "status": "info",
             "message": "No scraping history available yet",
@@ -124,116 +294,184 @@ def logs():
             "history": []
         })
     
-    # Sort history by timestamp (newest first)
-    sorted_history = sorted(scraping_history, key=lambda x: x.get("timestamp", ""), reverse=True)
-    
-    # Calculate total accounts across all sessions
-    total_accounts = sum(session.get("total_accounts", 0) for session in scraping_history)
-    
     return jsonify({
         "status": "success",
         "message": "Returning complete scraping history",
-        "total_sessions": len(scraping_history),
+        "total_sessions": total_sessions,
         "total_accounts_all_time": total_accounts,
         "history": sorted_history
     })
 
-@app.route('/accounts')
-def get_accounts():
-    """Run the scraping process and return accounts in JSON"""
-    global scraping_status, latest_results
+async def run_scraping(job_id):
+    """Run one scraping job on the background event loop"""
+    global latest_results, scrape_semaphore
     
-    # Check if scraping is already running
-    if scraping_status["is_running"]:
-        return jsonify({
-            "status": "error",
-            "message": "Scraping is already in progress. Please check /status for progress."
-        }), 409
+    if scrape_semaphore is None:
+        scrape_semaphore = asyncio.Semaphore(max_concurrent_scrapes)
     
-    # Start scraping in a background thread
-    def run_scraping():
-        global scraping_status, latest_results
-        
+    async with scrape_semaphore:
         try:
             # Update status
-            scraping_status["is_running"] = True
-            scraping_status["started_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            scraping_status["current_task"] = "Initializing"
-            scraping_status["progress"] = 0
-            scraping_status["error"] = None
-            scraping_status["results"] = None
+            update_job(
+                job_id,
+                status="running",
+                is_running=True,
+                started_at=now_str(),
+                current_task="Initializing",
+                progress=0
+            )
             
             # Create automation instance
-            scraping_status["current_task"] = "Creating automation instance"
-            scraping_status["progress"] = 10
-            automation = OxaamAutomation(headless=True, save_results=False)
-            
-            # Override methods to update status
-            original_register = automation.register_account
-            async def register_with_status(page):
-                scraping_status["current_task"] = "Registering new account"
-                scraping_status["progress"] = 20
-                return await original_register(page)
-            automation.register_account = register_with_status
-            
-            original_browse = automation.browse_free_services
-            async def browse_with_status(page):
-                scraping_status["current_task"] = "Navigating to free services"
-                scraping_status["progress"] = 40
-                return await original_browse(page)
-            automation.browse_free_services = browse_with_status
-            
-            original_extract = automation.extract_all_accounts
-            async def extract_with_status(page):
-                scraping_status["current_task"] = "Extracting accounts"
-                scraping_status["progress"] = 60
-                result = await original_extract(page)
-                scraping_status["progress"] = 80
-                return result
-            automation.extract_all_accounts = extract_with_status
+            update_job(job_id, current_task="Creating automation instance", progress=10)
+            automation = OxaamAutomation(
+                headless=True,
+                save_results=False,
+                progress_callback=lambda task, percent: update_job(job_id, current_task=task, progress=percent)
+            )
             
             # Run the automation
-            scraping_status["current_task"] = "Starting browser automation"
-            scraping_status["progress"] = 5
-            asyncio.run(automation.run())
+            update_job(job_id, current_task="Starting browser automation", progress=5)
+            await automation.run()
             
-            # Update latest results
+            # Update latest results (a fresh dict that is never mutated afterwards,
+            # so the same object can be shared with history without copying)
             latest_results = {
                 "session_id": automation.session_id,
                 "oxaam_account": automation.account_credentials,
                 "free_accounts": automation.free_accounts,
                 "total_accounts": len(automation.free_accounts),
                 "debug_html_url": automation.catbox_url if hasattr(automation, 'catbox_url') else None,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "timestamp": now_str()
             }
             
             # Save to history
-            save_to_history(latest_results.copy())
+            save_to_history(latest_results)
             
             # Update status
-            scraping_status["current_task"] = "Completed"
-            scraping_status["progress"] = 100
-            scraping_status["results"] = latest_results
-            scraping_status["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            update_job(
+                job_id,
+                status="completed",
+                current_task="Completed",
+                progress=100,
+                results=latest_results,
+                completed_at=now_str()
+            )
             
         except Exception as e:
-            scraping_status["error"] = str(e)
-            scraping_status["current_task"] = "Error occurred"
-            scraping_status["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        finally:
-            scraping_status["is_running"] = False
+            update_job(
+                job_id,
+                status="failed",
+                error=str(e),
+                current_task="Error occurred",
+                completed_at=now_str()
+            )
+
+def finalize_job(job_id):
+    """Mark a job as finished once its coroutine is done, even if cancelled"""
+    def callback(future):
+        if future.cancelled():
+            update_job(job_id, status="failed", error="Cancelled", is_running=False, completed_at=now_str())
+        else:
+            update_job(job_id, is_running=False)
+    return callback
+
+def prune_jobs():
+    """Forget the oldest finished jobs once more than max_tracked_jobs are tracked"""
+    with jobs_lock:
+        for job_id in list(jobs):
+            if len(jobs) <= max_tracked_jobs:
+                break
+            if jobs[job_id]["status"] in ("completed", "failed") and not jobs[job_id]["is_running"]:
+                del jobs[job_id]
+
+@app.route('/accounts', methods=['GET', 'POST'])
+def get_accounts():
+    """Queue a scraping job and return its id"""
+    global latest_job_id, scraping_status
     
-    # Start the background thread
-    thread = threading.Thread(target=run_scraping)
-    thread.daemon = True
-    thread.start()
+    job_id = uuid.uuid4().hex
+    with jobs_lock:
+        # Backpressure: once every slot and queue place is taken, point the
+        # caller at the newest active job instead of queueing another scrape
+        active = [jid for jid, job in jobs.items() if job["status"] in ("queued", "running") or job["is_running"]]
+        if len(active) >= max_concurrent_scrapes + max_queued_scrapes:
+            return jsonify({
+                "status": "error",
+                "message": "Too many scraping jobs queued. Check status_url for progress.",
+                "job_id": active[-1],
+                "status_url": f"/status/{active[-1]}"
+            }), 429
+        
+        jobs[job_id] = {
+            "job_id": job_id,
+            "status": "queued",
+            "is_running": False,
+            "queued_at": now_str(),
+            "started_at": None,
+            "completed_at": None,
+            "current_task": "Queued",
+            "progress": 0,
+            "error": None,
+            "results": None
+        }
+        latest_job_id = job_id
+        scraping_status = jobs[job_id]
+    prune_jobs()
+    
+    # Submit the scrape to the persistent event loop
+    future = asyncio.run_coroutine_threadsafe(run_scraping(job_id), scraping_loop)
+    future.add_done_callback(finalize_job(job_id))
     
     # Return initial response
     return jsonify({
-        "status": "started",
-        "message": "Scraping process started. Check /status for progress.",
-        "status_url": "/status"
-    })
+        "status": "queued",
+        "job_id": job_id,
+        "message": "Scraping job queued. Check status_url for progress.",
+        "status_url": f"/status/{job_id}",
+        "result_url": f"/result/{job_id}"
+    }), 202
+
+@app.route('/status/<job_id>')
+def job_status(job_id):
+    """Check the progress of a single scraping job"""
+    snapshot = jobs.get(job_id)
+    if snapshot is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown job id: {job_id}"
+        }), 404
+    return jsonify(snapshot)
+
+@app.route('/result/<job_id>')
+def job_result(job_id):
+    """Get the results of a finished scraping job"""
+    snapshot = jobs.get(job_id)
+    if snapshot is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown job id: {job_id}"
+        }), 404
+    
+    if snapshot["status"] == "completed":
+        return jsonify({
+            "status": "success",
+            "job_id": job_id,
+            "data": snapshot["results"]
+        })
+    if snapshot["status"] == "failed":
+        return jsonify({
+            "status": "error",
+            "job_id": job_id,
+            "message": snapshot["error"]
+        }), 500
+    return jsonify({
+        "status": snapshot["status"],
+        "job_id": job_id,
+        "message": "Job has not finished yet. Check status_url for progress.",
+        "status_url": f"/status/{job_id}"
+    }), 202
 
 if __name__ == '__main__':
+    from bootstrap import ensure_chromium
+    ensure_chromium()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
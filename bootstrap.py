@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Playwright keeps its browsers here unless PLAYWRIGHT_BROWSERS_PATH overrides it
+browsers_dir = Path(os.environ.get("PLAYWRIGHT_BROWSERS_PATH", "~/.cache/ms-playwright")).expanduser()
+sentinel_file = browsers_dir / ".oxaam-chromium-installed"
+
+def ensure_chromium():
+    """Install Playwright's Chromium once for non-container deploys
+
+    The Docker image bakes the browser in at build time; this only runs the
+    installer when the sentinel file is missing, so normal starts skip it.
+    """
+    if sentinel_file.exists():
+        return
+    
+    print("📦 Installing Playwright Chromium (first run only)...")
+    subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
+    sentinel_file.parent.mkdir(parents=True, exist_ok=True)
+    sentinel_file.touch()
+
+if __name__ == "__main__":
+    ensure_chromium()
@@ -1,15 +1,235 @@
 import asyncio
 import random
+import secrets
 import string
 import json
-import subprocess
-import re
+import logging
+import logging.handlers
+import sys
 from datetime import datetime
 from pathlib import Path
+import aiohttp
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+# Progress messages; handlers are left to the caller (main() buffers them for the CLI)
+logger = logging.getLogger('oxaam')
+
+def _flush_logs():
+    """Flush whatever handlers the caller attached to the oxaam logger"""
+    for handler in logger.handlers:
+        handler.flush()
+
+try:
+    # Optional: faster JSON encoding for result files, stdlib json otherwise
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: the third-party regex module supports possessive quantifiers
+    # (no backtracking into a run once it has matched) on every Python version
+    import regex as _re
+    _POSSESSIVE = True
+except ImportError:
+    import re as _re
+    _POSSESSIVE = sys.version_info >= (3, 11)
+_PLUS = '++' if _POSSESSIVE else '+'
+_STAR = '*+' if _POSSESSIVE else '*'
+
+# Extraction patterns, compiled once at import instead of on every block
+def _compile_field_patterns(field_patterns):
+    """Fuse {kind: (before, value, after)} patterns into one alternation of named groups"""
+    # Compiled as a bytes pattern: the HTML fallback scans the UTF-8 page as-is
+    # and only decodes the small values it captures
+    return _re.compile('|'.join(
+        f'{before}(?P<{kind}>{value}){after}' for kind, (before, value, after) in field_patterns.items()
+    ).encode('utf-8'))
+
+# Match kinds that end the scan for a block once all of them have been seen
+_FIRST_CHOICE_KINDS = frozenset({'service', 'email_span', 'password_span', 'official_link'})
+_EMAIL_ADDR_RE = _re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Characters used for generated passwords
+_PASSWORD_SYMBOLS = "!@#$%^&*"
+_PASSWORD_POOL = string.ascii_letters + string.digits + _PASSWORD_SYMBOLS
+# CSPRNG-backed Random, for the choices()/shuffle() helpers secrets doesn't expose
+_SYSTEM_RANDOM = secrets.SystemRandom()
+
+# Name pools for generated registrations
+_FIRST_NAMES = ("John", "Jane", "Mike", "Sarah", "David", "Emma", "Chris", "Lisa",
+                "Alex", "Maria", "Ryan", "Sophie", "Tom", "Anna", "Jack", "Emily")
+_LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+               "Davis", "Rodriguez", "Martinez", "Wilson", "Anderson", "Taylor")
+
+# Registration form fields as CSS selector unions, so one locator resolves
+# whichever variant the page uses instead of trying them one by one
+_NAME_SELECTOR = 'input[placeholder="Name"], input[name="name"], input[id="name"], #name'
+_EMAIL_SELECTOR = 'input[placeholder="Email"], input[name="email"], input[type="email"], #email'
+_PHONE_SELECTOR = 'input[placeholder="Contact No."], input[name="contact"], input[name="phone"], #contact'
+_PASSWORD_SELECTOR = 'input[placeholder="Password"], input[name="password"], input[type="password"], #password'
+_REGISTER_SELECTOR = 'button:has-text("Register"), button[type="submit"], input[type="submit"], button:has-text("Sign up")'
+
+# Chromium flags: the original stealth/sandbox settings plus switches that turn
+# off GPU, extensions and background services the scraper never uses
+_BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-features=Translate,BackForwardCache',
+    '--mute-audio'
+]
+
+# Subresource types the scraper never needs
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media"})
+
+async def _block_heavy_resources(route):
+    """Route handler that aborts subresources we don't need and lets the rest through"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+# Shared Playwright driver and one Chromium per headless setting, launched on
+# first use and kept warm across runs; each run only opens its own context
+_playwright = None
+_browsers = {}
+_browser_lock = None
+
+async def get_browser(headless=True):
+    """Return the shared Chromium for this headless setting, launching it if needed"""
+    global _playwright, _browser_lock
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    
+    async with _browser_lock:
+        browser = _browsers.get(headless)
+        if browser is None or not browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            browser = await _playwright.chromium.launch(headless=headless, args=_BROWSER_ARGS)
+            _browsers[headless] = browser
+        return browser
+
+async def close_browser():
+    """Close every shared browser and stop the Playwright driver"""
+    global _playwright
+    browsers = list(_browsers.values())
+    _browsers.clear()
+    for browser in browsers:
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+# Shared HTTP session for catbox uploads, so repeated uploads reuse pooled
+# keep-alive connections instead of a new TLS handshake each time
+_http_session = None
+
+def _get_http_session():
+    """Return the shared aiohttp session, creating it on the running loop if needed"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60)
+        )
+    return _http_session
+
+async def close_http_session():
+    """Close the shared aiohttp session, if one was opened"""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+# Errors worth another attempt: network hiccups and timeouts, not bad input
+_RETRYABLE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, PlaywrightTimeout)
+
+# Overall budget in seconds for one catbox upload, retries included
+_UPLOAD_DEADLINE = 60
+
+# Per-attempt page.goto timeout in ms; three attempts plus backoff stay close
+# to the single 30 s load a navigation was allowed before retries
+_NAVIGATION_TIMEOUT = 10000
+
+async def _retry(fn, attempts=3, base=0.5):
+    """Await fn(), retrying transient errors with jittered exponential backoff"""
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except _RETRYABLE_ERRORS:
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(base * 2 ** attempt + random.random() * 0.1)
+
+# Runs in the page against every <details> element and returns the raw fields
+# per block, so Python never has to pull and regex-scan the whole HTML
+_EXTRACT_DETAILS_JS = r"""(blocks) => blocks.map((block) => {
+    const html = block.innerHTML;
+    const first = (re) => { const m = html.match(re); return m ? m[1].trim() : ""; };
+    const copies = Array.from(block.querySelectorAll("[data-copy]"), (el) => el.getAttribute("data-copy") || "");
+    const strong = block.querySelector("strong");
+    const link = block.querySelector('a[href*="official.php"]');
+    const bare = first(/Password\s*➜\s*([^\s<]+)/i);
+    return {
+        service: strong ? strong.textContent.replace(/\u00a0/g, " ").trim() : "",
+        email: first(/Email\s*➜\s*<span>([^<]+)<\/span>/i)
+            || first(/Email\s*➜\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})/i)
+            || copies.find((c) => /^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$/.test(c))
+            || "",
+        password: first(/Password\s*➜\s*<span>([^<]+)<\/span>/i)
+            || (copies.find((c) => !c.includes("@") && c.length > 5) || "").trim()
+            || (bare.includes("@") ? "" : bare),
+        official_website: link ? link.getAttribute("href") : "",
+        is_cookie: html.toLowerCase().includes("cookie")
+    };
+})"""
+
+def _split_details_blocks(html_bytes):
+    """Return the inner HTML of every <details> block with a linear bytes.find scan"""
+    # Tags are matched case-insensitively on a lowercased copy; bytes.lower()
+    # only touches ASCII letters, so offsets always line up with the original
+    lowered = html_bytes.lower()
+    
+    blocks = []
+    pos = 0
+    while True:
+        start = lowered.find(b'<details', pos)
+        if start < 0:
+            break
+        tag_end = lowered.find(b'>', start)
+        if tag_end < 0:
+            break
+        end = lowered.find(b'</details>', tag_end)
+        if end < 0:
+            break
+        blocks.append(html_bytes[tag_end + 1:end])
+        pos = end + len(b'</details>')
+    return blocks
+
 class OxaamAutomation:
-    def __init__(self, headless=True, save_results=True):
+    # Everything the HTML extractor looks for, keyed by the kind of value captured:
+    # (text before the value, the value, text after it). The entries are fused
+    # into one alternation (tried in this order), so each block is scanned once
+    # and a new field only needs an entry here plus handling of its kind
+    _FIELD_PATTERNS = {
+        'service': (r'<strong>', r'[^<]' + _PLUS, r'</strong>'),
+        'email_span': (r'(?i:Email\s*➜\s*<span>)', r'[^<]' + _PLUS, r'(?i:</span>)'),
+        'email_bare': (r'(?i:Email\s*➜\s*)', r'[a-zA-Z0-9._%+-]' + _PLUS + r'@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', r''),
+        'password_span': (r'(?i:Password\s*➜\s*<span>)', r'[^<]' + _PLUS, r'(?i:</span>)'),
+        'password_bare': (r'(?i:Password\s*➜\s*)', r'[^\s<]' + _PLUS, r''),
+        'data_copy': (r'data-copy="', r'[^"]' + _PLUS, r'"'),
+        'official_link': (r'href="', r'[^"]*official\.php[^"]' + _STAR, r'"')
+    }
+    _FIELD_RE = _compile_field_patterns(_FIELD_PATTERNS)
+    
+    def __init__(self, headless=True, save_results=True, progress_callback=None, verbose=False, debug=False):
         self.base_url = "https://www.oxaam.com/"
         self.headless = headless
         self.save_results = save_results
@@ -22,242 +242,334 @@ class OxaamAutomation:
         self.free_accounts = []
         self.session_id = self.generate_session_id()
         self.catbox_url = ""
-        self.registered_users_file = "oxaam_registered_users.json"
+        # One JSON object per line, appended on each registration
+        self.registered_users_file = "oxaam_registered_users.jsonl"
+        # Single JSON array written by older versions, still read if present
+        self.legacy_registered_users_file = "oxaam_registered_users.json"
+        # Emails registered so far, read once here and kept current by save_registered_user
+        self._registered_emails = {u.get('email') for u in self.load_registered_users()}
+        # Optional callable(task, percent) notified as the automation advances
+        self.progress_callback = progress_callback
+        # Print per-service details while extracting
+        self.verbose = verbose
+        # Log full tracebacks for unexpected errors
+        self.debug = debug
+    
+    def _progress(self, task, percent):
+        """Report progress to the callback, if one was given"""
+        if self.progress_callback:
+            self.progress_callback(task, percent)
     
     def generate_session_id(self):
         """Generate unique session ID"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        random_suffix = secrets.token_hex(3)
         return f"session_{timestamp}_{random_suffix}"
     
+    def iter_registered_users(self):
+        """Lazily yield registered users, legacy JSON array first, then the JSONL file"""
+        legacy = Path(self.legacy_registered_users_file)
+        if legacy.exists():
+            try:
+                with open(legacy, 'r') as f:
+                    legacy_users = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️  Could not read {legacy}: {str(e)}")
+            else:
+                yield from legacy_users
+        if not Path(self.registered_users_file).exists():
+            return
+        
+        # A torn or corrupt line is skipped on its own, so the users around it
+        # still count towards the one-registration-per-run guard
+        skipped = 0
+        with open(self.registered_users_file, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    user = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if isinstance(user, dict):
+                    yield user
+                else:
+                    skipped += 1
+        if skipped:
+            logger.warning(f"⚠️  Skipped {skipped} unreadable line(s) in {self.registered_users_file}")
+    
     def load_registered_users(self):
         """Load list of registered users"""
         try:
-            if Path(self.registered_users_file).exists():
-                with open(self.registered_users_file, 'r') as f:
-                    return json.load(f)
-            return []
-        except:
+            return list(self.iter_registered_users())
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Could not load registered users: {str(e)}")
             return []
     
     def save_registered_user(self, email):
-        """Save registered user to prevent duplicate registration"""
+        """Append registered user to prevent duplicate registration"""
         try:
-            users = self.load_registered_users()
-            users.append({
+            user = {
                 "email": email,
-                "registered_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "registered_at": datetime.now().isoformat(sep=' ', timespec='seconds'),
                 "session_id": self.session_id
-            })
-            with open(self.registered_users_file, 'w') as f:
-                json.dump(users, f, indent=2)
+            }
+            if orjson is not None:
+                with open(self.registered_users_file, 'ab') as f:
+                    f.write(orjson.dumps(user) + b"\n")
+            else:
+                with open(self.registered_users_file, 'a') as f:
+                    f.write(json.dumps(user) + "\n")
+            self._registered_emails.add(email)
         except Exception as e:
-            print(f"⚠️  Could not save registered user: {str(e)}")
+            logger.warning(f"⚠️  Could not save registered user: {str(e)}")
     
     def is_already_registered(self, email):
         """Check if user already registered in this run"""
-        users = self.load_registered_users()
-        return any(u['email'] == email for u in users)
+        return email in self._registered_emails
     
     def generate_random_phone(self):
         """Generate random phone number starting with 869"""
-        random_digits = ''.join([str(random.randint(0, 9)) for _ in range(9)])
-        return f"869{random_digits}"
+        return f"869{random.randrange(10**9):09d}"
     
     def generate_random_email(self):
         """Generate random email with timestamp for uniqueness"""
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+        random_string = secrets.token_hex(4)
         return f"user_{timestamp}_{random_string}@gmail.com"
     
     def generate_random_name(self):
         """Generate random name"""
-        first_names = ["John", "Jane", "Mike", "Sarah", "David", "Emma", "Chris", "Lisa", 
-                       "Alex", "Maria", "Ryan", "Sophie", "Tom", "Anna", "Jack", "Emily"]
-        last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", 
-                      "Davis", "Rodriguez", "Martinez", "Wilson", "Anderson", "Taylor"]
-        return f"{random.choice(first_names)} {random.choice(last_names)}"
+        return f"{random.choice(_FIRST_NAMES)} {random.choice(_LAST_NAMES)}"
     
     def generate_strong_password(self):
         """Generate a strong random password"""
-        length = random.randint(12, 16)
-        chars = string.ascii_letters + string.digits + "!@#$%^&*"
-        password = ''.join(random.choices(chars, k=length))
-        if not any(c.isupper() for c in password):
-            password = password[:-1] + random.choice(string.ascii_uppercase)
-        if not any(c.isdigit() for c in password):
-            password = password[:-1] + random.choice(string.digits)
-        return password
+        length = 12 + secrets.randbelow(5)
+        # One uppercase letter, digit and symbol by construction, the rest from
+        # the whole pool, then shuffled so the guaranteed ones can be anywhere
+        chars = [
+            secrets.choice(string.ascii_uppercase),
+            secrets.choice(string.digits),
+            secrets.choice(_PASSWORD_SYMBOLS)
+        ]
+        chars += _SYSTEM_RANDOM.choices(_PASSWORD_POOL, k=length - len(chars))
+        _SYSTEM_RANDOM.shuffle(chars)
+        return ''.join(chars)
     
-    def upload_to_catbox(self, html_content, description="debug"):
-        """Upload HTML content directly to catbox.moe and return URL"""
+    async def upload_to_catbox(self, html_content, description="debug"):
+        """Upload HTML content (bytes, or str) directly to catbox.moe and return URL"""
         try:
-            print(f"\n📤 Uploading {description} HTML to catbox.moe...")
-            
-            # Create temp file in memory
-            temp_filename = f"oxaam_{description}_{self.session_id}.html"
-            temp_path = Path(temp_filename)
-            
-            # Write content temporarily
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # Use curl to upload
-            result = subprocess.run(
-                [
-                    'curl', '-s', '-F', 'reqtype=fileupload',
-                    '-F', f'fileToUpload=@{temp_filename}',
-                    'https://catbox.moe/user/api.php'
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # Delete temp file immediately
-            temp_path.unlink(missing_ok=True)
-            
-            if result.returncode == 0 and result.stdout:
-                url = result.stdout.strip()
-                if url.startswith('http'):
-                    print(f"✅ Upload successful!")
-                    print(f"🔗 {description} URL: {url}")
-                    return url
-                else:
-                    print(f"⚠️  Upload response: {result.stdout}")
-                    return None
+            logger.info(f"\n📤 Uploading {description} HTML to catbox.moe...")
+            html_bytes = html_content if isinstance(html_content, bytes) else html_content.encode('utf-8')
+            
+            async def post():
+                # Send the HTML straight from memory as a multipart file field;
+                # the form is rebuilt per attempt since aiohttp consumes it on send
+                form = aiohttp.FormData()
+                form.add_field('reqtype', 'fileupload')
+                form.add_field(
+                    'fileToUpload',
+                    html_bytes,
+                    filename=f"oxaam_{description}_{self.session_id}.html",
+                    content_type='text/html'
+                )
+                async with _get_http_session().post('https://catbox.moe/user/api.php', data=form) as response:
+                    # Rate limiting and server errors are transient, so raise to retry them
+                    if response.status == 429 or response.status >= 500:
+                        response.raise_for_status()
+                    return response.status, (await response.text()).strip()
+            
+            # Each attempt is capped by the session timeout, the whole upload by the deadline
+            status, body = await asyncio.wait_for(_retry(post), timeout=_UPLOAD_DEADLINE)
+            
+            if status == 200 and body.startswith('http'):
+                logger.info(f"✅ Upload successful!")
+                logger.info(f"🔗 {description} URL: {body}")
+                return body
             else:
-                print(f"❌ Upload failed: {result.stderr}")
+                logger.warning(f"⚠️  Upload response ({status}): {body}")
                 return None
                 
-        except subprocess.TimeoutExpired:
-            print("❌ Upload timeout after 30 seconds")
+        except asyncio.TimeoutError:
+            logger.error(f"❌ Upload timed out, gave up within {_UPLOAD_DEADLINE} seconds (retries included)")
             return None
         except Exception as e:
-            print(f"❌ Upload error: {str(e)}")
+            logger.error(f"❌ Upload error: {str(e)}")
             return None
-        finally:
-            # Ensure temp file is deleted
-            try:
-                temp_path.unlink(missing_ok=True)
-            except:
-                pass
     
-    def extract_credentials_from_html(self, html_content):
-        """Extract all credentials from HTML using regex"""
-        print("\n🔍 Extracting credentials from HTML...")
-        accounts = []
+    def _build_account(self, idx, service_name, email, password, official_link, is_cookie_service, retrieved_at):
+        """Build the account record for one service block, or None if it has no credentials"""
+        service_name = service_name or f"Service_{idx}"
+        if self.verbose:
+            logger.info(f"\n{idx}. 🎯 Processing: {service_name}")
         
-        # Find all <details> blocks
-        details_pattern = r'<details[^>]*>(.*?)</details>'
-        details_blocks = re.findall(details_pattern, html_content, re.DOTALL | re.IGNORECASE)
+        if official_link and not official_link.startswith('http'):
+            official_link = f"https://www.oxaam.com/{official_link}"
         
-        print(f"📦 Found {len(details_blocks)} service blocks")
+        if not (email or password or is_cookie_service):
+            if self.verbose:
+                logger.warning(f"   ⚠️  No credentials found")
+            return None
         
-        for idx, block in enumerate(details_blocks, 1):
-            try:
-                # Extract service name from summary
-                service_name_match = re.search(r'<strong>([^<]+?(?:Premium|PREMIUM|PRO|Plus|AI|TV\+|Music|Games)?[^<]*?)</strong>', block)
-                service_name = service_name_match.group(1).strip() if service_name_match else f"Service_{idx}"
-                
-                # Clean HTML entities
-                service_name = service_name.replace('&nbsp;', ' ')
-                
-                print(f"\n{idx}. 🎯 Processing: {service_name}")
-                
-                # Try to find email
-                email = ""
-                email_patterns = [
-                    r'Email\s*➜\s*<span>([^<]+)</span>',
-                    r'Email\s*➜\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'data-copy="([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"'
-                ]
-                
-                for pattern in email_patterns:
-                    match = re.search(pattern, block, re.IGNORECASE)
-                    if match:
-                        email = match.group(1).strip()
-                        break
-                
-                # Try to find password - more comprehensive search
-                password = ""
-                
-                # Method 1: Look for Password ➜ pattern
-                password_match = re.search(r'Password\s*➜\s*<span>([^<]+)</span>', block, re.IGNORECASE)
-                if password_match:
-                    password = password_match.group(1).strip()
-                
-                # Method 2: Find all data-copy values and exclude emails
-                if not password:
-                    data_copy_matches = re.findall(r'data-copy="([^"]+)"', block)
-                    for match in data_copy_matches:
-                        if '@' not in match and len(match) > 5:  # Not an email and reasonable length
-                            password = match.strip()
-                            break
-                
-                # Method 3: Look for password in div after Password text
-                if not password:
-                    password_div_match = re.search(r'Password\s*➜\s*([^\s<]+)', block, re.IGNORECASE)
-                    if password_div_match:
-                        pwd = password_div_match.group(1).strip()
-                        if '@' not in pwd:
-                            password = pwd
-                
-                # Try to find official website
-                official_link = ""
-                link_match = re.search(r'href="([^"]*official\.php[^"]*)"', block)
-                if link_match:
-                    official_link = link_match.group(1)
-                    if not official_link.startswith('http'):
-                        official_link = f"https://www.oxaam.com/{official_link}"
-                
-                # Check if this is a cookie-based service
-                is_cookie_service = 'cookie' in block.lower() or 'cookiejson' in block.lower()
-                
-                if email or password or is_cookie_service:
-                    account_info = {
-                        "service": service_name,
-                        "email": email if email else "Cookie-based login",
-                        "password": password if password else "N/A",
-                        "official_website": official_link if official_link else "N/A",
-                        "type": "Cookie-based" if is_cookie_service else "Email/Password",
-                        "retrieved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    accounts.append(account_info)
-                    
-                    print(f"   ✅ Email: {account_info['email']}")
-                    print(f"   ✅ Password: {account_info['password']}")
-                    print(f"   ✅ Type: {account_info['type']}")
-                else:
-                    print(f"   ⚠️  No credentials found")
+        account_info = {
+            "service": service_name,
+            "email": email if email else "Cookie-based login",
+            "password": password if password else "N/A",
+            "official_website": official_link if official_link else "N/A",
+            "type": "Cookie-based" if is_cookie_service else "Email/Password",
+            "retrieved_at": retrieved_at
+        }
+        
+        if self.verbose:
+            logger.info(
+                f"   ✅ Email: {account_info['email']}\n"
+                f"   ✅ Password: {account_info['password']}\n"
+                f"   ✅ Type: {account_info['type']}"
+            )
+        return account_info
+    
+    def extract_credentials_from_dom(self, blocks):
+        """Build accounts from the per-block fields collected in the page by _EXTRACT_DETAILS_JS"""
+        logger.info("\n🔍 Extracting credentials from page DOM...")
+        logger.info(f"📦 Found {len(blocks)} service blocks")
+        
+        # One timestamp for the whole pass rather than one per block
+        retrieved_at = datetime.now().isoformat(sep=' ', timespec='seconds')
+        built = (
+            self._build_account(
+                idx,
+                block["service"],
+                block["email"],
+                block["password"],
+                block["official_website"],
+                block["is_cookie"],
+                retrieved_at
+            )
+            for idx, block in enumerate(blocks, 1)
+        )
+        return [account for account in built if account]
+    
+    def _parse_block(self, block, idx, retrieved_at):
+        """Parse one <details> block into an account record, or None"""
+        try:
+            # Check if this is a cookie-based service
+            lowered = block.lower()
+            is_cookie_service = b'cookie' in lowered
+            
+            # Every credential pattern needs an Email/Password label or a data-copy
+            # attribute, so a block with none of them can be dropped with a few
+            # substring checks instead of a regex scan (verbose still parses it
+            # so the per-block log stays complete)
+            if not (is_cookie_service or self.verbose or b'email' in lowered
+                    or b'password' in lowered or b'data-copy' in lowered):
+                return None
+            
+            # Single pass over the block, keeping the first hit of each kind
+            found = {}
+            for match in self._FIELD_RE.finditer(block):
+                kind = match.lastgroup
+                value = match.group(kind).decode('utf-8', 'replace')
+                if kind == 'data_copy':
+                    # data-copy holds either the email or (if not an email) the password
+                    if _EMAIL_ADDR_RE.fullmatch(value):
+                        kind = 'email_copy'
+                    elif '@' not in value and len(value) > 5:  # Not an email and reasonable length
+                        kind = 'password_copy'
+                    else:
+                        continue
+                found.setdefault(kind, value)
+                # Stop once every field has its highest-priority form; later hits can't win
+                if _FIRST_CHOICE_KINDS.issubset(found):
+                    break
             
-            except Exception as e:
-                print(f"   ❌ Error processing block: {str(e)}")
-                continue
+            # Email: <span> after the label, then bare address after it, then data-copy
+            email = (found.get('email_span') or found.get('email_bare') or found.get('email_copy') or "").strip()
+            
+            # Password: <span> after the label, then data-copy, then bare text after it
+            password = (found.get('password_span') or found.get('password_copy') or "").strip()
+            if not password and '@' not in found.get('password_bare', '@'):
+                password = found['password_bare'].strip()
+            
+            return self._build_account(
+                idx,
+                found.get('service', "").strip().replace('&nbsp;', ' '),
+                email,
+                password,
+                found.get('official_link', ""),
+                is_cookie_service,
+                retrieved_at
+            )
+        
+        except Exception as e:
+            logger.error(f"   ❌ Error processing block: {str(e)}")
+            return None
+    
+    def extract_credentials_from_html(self, html_content):
+        """Extract all credentials from HTML (UTF-8 bytes, or str) using regex"""
+        logger.info("\n🔍 Extracting credentials from HTML...")
+        
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8', 'replace')
         
-        return accounts
+        # Find all <details> blocks
+        details_blocks = _split_details_blocks(html_content)
+        
+        logger.info(f"📦 Found {len(details_blocks)} service blocks")
+        
+        # One timestamp for the whole pass rather than one per block
+        retrieved_at = datetime.now().isoformat(sep=' ', timespec='seconds')
+        parsed = (self._parse_block(block, idx, retrieved_at) for idx, block in enumerate(details_blocks, 1))
+        return [account for account in parsed if account]
+    
+    async def _wait_for_settle(self, page, timeout=10000):
+        """Wait for the page's network to go idle instead of sleeping a fixed time"""
+        try:
+            await page.wait_for_load_state("networkidle", timeout=timeout)
+        except PlaywrightTimeout:
+            # Pages with polling or long-lived requests never go idle; use what has loaded
+            pass
+    
+    async def _registration_form(self, page):
+        """Return the form holding the name field, or the whole page if it isn't in a form"""
+        # Selector unions match in document order, so without this scope a login
+        # or newsletter form earlier on the page could take the fills and clicks
+        form = page.locator("form", has=page.locator(_NAME_SELECTOR))
+        return form.first if await form.count() else page
+    
+    async def _fill_first(self, scope, selector, value, label):
+        """Fill the first element in scope matching a selector union, reporting failure instead of raising"""
+        try:
+            await scope.locator(selector).first.fill(value, timeout=5000)
+            logger.info(f"   ✅ {label} filled")
+            return True
+        except Exception:
+            logger.warning(f"   ⚠️  Could not find {label.lower()} field")
+            return False
     
     async def register_account(self, page):
         """Register a new account on Oxaam with enhanced error handling"""
-        print(f"\n{'='*60}")
-        print(f"🆕 NEW REGISTRATION SESSION: {self.session_id}")
-        print(f"{'='*60}")
+        self._progress("Registering new account", 20)
+        logger.info(f"\n{'='*60}")
+        logger.info(f"🆕 NEW REGISTRATION SESSION: {self.session_id}")
+        logger.info(f"{'='*60}")
         
         # Generate credentials first to check if already registered
         email = self.generate_random_email()
         
         # Check if this email was already registered
         if self.is_already_registered(email):
-            print(f"⚠️  Email {email} already registered in this session")
-            print("⚠️  Skipping registration - using existing account")
+            logger.warning(f"⚠️  Email {email} already registered in this session")
+            logger.warning("⚠️  Skipping registration - using existing account")
             return False
         
-        print("🔄 Navigating to Oxaam.com...")
+        logger.info("🔄 Navigating to Oxaam.com...")
         try:
-            await page.goto(self.base_url, wait_until="domcontentloaded", timeout=30000)
-            await page.wait_for_timeout(3000)
+            await _retry(lambda: page.goto(self.base_url, wait_until="domcontentloaded", timeout=_NAVIGATION_TIMEOUT))
+            # Proceed as soon as the registration form is on the page
+            await page.wait_for_selector(_NAME_SELECTOR, timeout=10000)
         except Exception as e:
-            print(f"❌ Failed to load page: {str(e)}")
+            logger.error(f"❌ Failed to load page: {str(e)}")
             return False
         
         # Generate other credentials
@@ -269,101 +581,38 @@ class OxaamAutomation:
         self.account_credentials["oxaam_email"] = email
         self.account_credentials["oxaam_password"] = password
         self.account_credentials["oxaam_phone"] = phone
-        self.account_credentials["created_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.account_credentials["created_at"] = datetime.now().isoformat(sep=' ', timespec='seconds')
         
-        print(f"\n📝 Registering with:")
-        print(f"   👤 Name: {name}")
-        print(f"   📧 Email: {email}")
-        print(f"   📱 Phone: {phone}")
-        print(f"   🔑 Password: {password}")
+        logger.info(f"\n📝 Registering with:")
+        logger.info(f"   👤 Name: {name}")
+        logger.info(f"   📧 Email: {email}")
+        logger.info(f"   📱 Phone: {phone}")
+        logger.info(f"   🔑 Password: {password}")
         
         try:
-            # Try multiple selector patterns for registration form
-            name_selectors = [
-                'input[placeholder="Name"]',
-                'input[name="name"]',
-                'input[id="name"]',
-                '#name'
-            ]
-            
-            email_selectors = [
-                'input[placeholder="Email"]',
-                'input[name="email"]',
-                'input[type="email"]',
-                '#email'
-            ]
-            
-            phone_selectors = [
-                'input[placeholder="Contact No."]',
-                'input[name="contact"]',
-                'input[name="phone"]',
-                '#contact'
-            ]
-            
-            password_selectors = [
-                'input[placeholder="Password"]',
-                'input[name="password"]',
-                'input[type="password"]',
-                '#password'
-            ]
-            
-            # Fill name
-            for selector in name_selectors:
-                try:
-                    await page.fill(selector, name, timeout=5000)
-                    print("   ✅ Name filled")
-                    break
-                except:
-                    continue
-            
-            # Fill email
-            for selector in email_selectors:
-                try:
-                    await page.fill(selector, email, timeout=5000)
-                    print("   ✅ Email filled")
-                    break
-                except:
-                    continue
-            
-            # Fill phone
-            for selector in phone_selectors:
-                try:
-                    await page.fill(selector, phone, timeout=5000)
-                    print("   ✅ Phone filled")
-                    break
-                except:
-                    continue
-            
-            # Fill password
-            for selector in password_selectors:
-                try:
-                    await page.fill(selector, password, timeout=5000)
-                    print("   ✅ Password filled")
-                    break
-                except:
-                    continue
-            
-            await page.wait_for_timeout(1000)
-            
-            # Click register button
-            register_selectors = [
-                'button:has-text("Register")',
-                'button[type="submit"]',
-                'input[type="submit"]',
-                'button:has-text("Sign up")'
-            ]
-            
-            for selector in register_selectors:
-                try:
-                    await page.click(selector, timeout=5000)
-                    print("   ✅ Register button clicked")
-                    break
-                except:
-                    continue
+            form = await self._registration_form(page)
+            
+            # Fill each field through a single locator over its selector union.
+            # Fields are filled one after another: fill() types into the focused
+            # element, so concurrent fills on one page could land in the wrong input
+            for label, selector, value in (
+                ("Name", _NAME_SELECTOR, name),
+                ("Email", _EMAIL_SELECTOR, email),
+                ("Phone", _PHONE_SELECTOR, phone),
+                ("Password", _PASSWORD_SELECTOR, password)
+            ):
+                await self._fill_first(form, selector, value, label)
+            
+            # Click register button (within the same form, so another form's submit can't win)
+            try:
+                await form.locator(_REGISTER_SELECTOR).first.click(timeout=5000)
+                logger.info("   ✅ Register button clicked")
+            except Exception:
+                logger.warning("   ⚠️  Could not find register button")
             
-            await page.wait_for_timeout(4000)
+            await self._wait_for_settle(page)
             
-            print("✅ Account registered successfully!")
+            logger.info("✅ Account registered successfully!")
             
             # Save this registered user
             self.save_registered_user(email)
@@ -371,12 +620,13 @@ class OxaamAutomation:
             return True
             
         except Exception as e:
-            print(f"❌ Error during registration: {str(e)}")
+            logger.error(f"❌ Error during registration: {str(e)}")
             return False
     
     async def browse_free_services(self, page):
         """Navigate to Browse Free Services with better error handling"""
-        print("\n🔄 Navigating to Browse Free Services...")
+        self._progress("Navigating to free services", 40)
+        logger.info("\n🔄 Navigating to Browse Free Services...")
         
         try:
             # Try multiple methods to find the link
@@ -391,55 +641,69 @@ class OxaamAutomation:
             for selector in link_selectors:
                 try:
                     await page.click(selector, timeout=5000)
-                    await page.wait_for_timeout(3000)
-                    print("✅ Navigated to Free Services page")
+                    await self._wait_for_settle(page)
+                    logger.info("✅ Navigated to Free Services page")
                     return True
                 except:
                     continue
             
-            print("⚠️  Could not find Free Services link, trying direct URL...")
-            await page.goto(f"{self.base_url}freeservice.php", wait_until="domcontentloaded")
-            await page.wait_for_timeout(3000)
+            logger.warning("⚠️  Could not find Free Services link, trying direct URL...")
+            await _retry(lambda: page.goto(f"{self.base_url}freeservice.php", wait_until="domcontentloaded", timeout=_NAVIGATION_TIMEOUT))
+            await self._wait_for_settle(page)
             return True
             
         except Exception as e:
-            print(f"❌ Error navigating to free services: {str(e)}")
+            logger.error(f"❌ Error navigating to free services: {str(e)}")
             return False
     
     async def extract_all_accounts(self, page):
-        """Extract all accounts from the page HTML"""
-        print("\n🎬 Extracting all free accounts from page...")
+        """Extract all accounts from the free services page"""
+        self._progress("Extracting accounts", 60)
+        logger.info("\n🎬 Extracting all free accounts from page...")
         
         try:
-            # Get the full page HTML
-            print("📸 Capturing page HTML...")
-            html_content = await page.content()
-            
-            # Upload to catbox
-            catbox_url = self.upload_to_catbox(html_content, "free_services_page")
-            if catbox_url:
-                self.catbox_url = catbox_url
-            
-            # Extract credentials from HTML
-            accounts = self.extract_credentials_from_html(html_content)
+            # Let the browser walk its own DOM and hand back just the fields per block
+            logger.info("🧭 Reading service blocks from the page...")
+            blocks = await page.eval_on_selector_all("details", _EXTRACT_DETAILS_JS)
+            accounts = self.extract_credentials_from_dom(blocks)
+            catbox_url = None
+            
+            if not accounts:
+                # Fall back to the raw HTML, and upload it so the page can be debugged
+                logger.warning("⚠️  Nothing found in the DOM, falling back to the page HTML...")
+                logger.info("📸 Capturing page HTML...")
+                # Encoded once; the upload and the parser both work on these bytes
+                html_bytes = (await page.content()).encode('utf-8', 'replace')
+                
+                # Upload to catbox in the background while the HTML is parsed;
+                # the regex parse runs in a worker thread so it doesn't stall the loop
+                # (run_in_executor rather than asyncio.to_thread to stay Python 3.8 compatible)
+                upload_task = asyncio.create_task(self.upload_to_catbox(html_bytes, "free_services_page"))
+                loop = asyncio.get_running_loop()
+                accounts = await loop.run_in_executor(None, self.extract_credentials_from_html, html_bytes)
+                
+                catbox_url = await upload_task
+                if catbox_url:
+                    self.catbox_url = catbox_url
             
             if accounts:
-                print(f"\n✅ Successfully extracted {len(accounts)} accounts!")
-                self.free_accounts.extend(accounts)
+                logger.info(f"\n✅ Successfully extracted {len(accounts)} accounts!")
                 
-                # Add catbox URL to each account
-                for account in self.free_accounts:
+                # Add catbox URL to the accounts from this page only
+                for account in accounts:
                     account['debug_html_url'] = catbox_url if catbox_url else "N/A"
+                self.free_accounts.extend(accounts)
             else:
-                print("⚠️  No accounts found in HTML")
+                logger.warning("⚠️  No accounts found in HTML")
             
             return len(accounts) > 0
             
         except Exception as e:
-            print(f"❌ Error extracting accounts: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"❌ Error extracting accounts: {e!r}", exc_info=self.debug)
             return False
+        
+        finally:
+            self._progress("Extracting accounts", 80)
     
     def save_to_file(self):
         """Save results to JSON file"""
@@ -456,113 +720,129 @@ class OxaamAutomation:
                 "debug_html_url": self.catbox_url if self.catbox_url else "N/A"
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            # Encode in one go and write with a single call
+            if orjson is not None:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                Path(filename).write_bytes(payload)
+            else:
+                Path(filename).write_text(json.dumps(data, indent=4, ensure_ascii=False), encoding='utf-8')
             
-            print(f"\n💾 Results saved to: {filename}")
+            logger.info(f"\n💾 Results saved to: {filename}")
         
         except Exception as e:
-            print(f"⚠️  Could not save results: {str(e)}")
+            logger.warning(f"⚠️  Could not save results: {str(e)}")
     
     def print_summary(self):
         """Print summary of all accounts"""
-        print("\n" + "="*60)
-        print("📊 AUTOMATION SUMMARY")
-        print("="*60)
-        print(f"🆔 Session ID: {self.session_id}")
+        # Write out buffered progress first so it doesn't trail the summary
+        _flush_logs()
         
-        print("\n🔐 Oxaam Account Credentials:")
-        print(f"   📧 Email: {self.account_credentials['oxaam_email']}")
-        print(f"   🔑 Password: {self.account_credentials['oxaam_password']}")
-        print(f"   📱 Phone: {self.account_credentials['oxaam_phone']}")
-        print(f"   🕐 Created: {self.account_credentials['created_at']}")
+        # Collect everything and write it once instead of one print() per line
+        lines = [
+            "\n" + "="*60,
+            "📊 AUTOMATION SUMMARY",
+            "="*60,
+            f"🆔 Session ID: {self.session_id}",
+            "\n🔐 Oxaam Account Credentials:",
+            f"   📧 Email: {self.account_credentials['oxaam_email']}",
+            f"   🔑 Password: {self.account_credentials['oxaam_password']}",
+            f"   📱 Phone: {self.account_credentials['oxaam_phone']}",
+            f"   🕐 Created: {self.account_credentials['created_at']}"
+        ]
         
         if self.catbox_url:
-            print(f"\n🐛 Debug HTML URL: {self.catbox_url}")
+            lines.append(f"\n🐛 Debug HTML URL: {self.catbox_url}")
         
-        print(f"\n🎁 Free Accounts Retrieved: {len(self.free_accounts)}")
-        print("-"*60)
+        lines.append(f"\n🎁 Free Accounts Retrieved: {len(self.free_accounts)}")
+        lines.append("-"*60)
         
         for i, account in enumerate(self.free_accounts, 1):
-            print(f"\n{i}. {account['service']}")
-            print(f"   📧 Email: {account['email']}")
-            print(f"   🔑 Password: {account['password']}")
-            print(f"   🔗 Website: {account['official_website']}")
-            print(f"   📌 Type: {account['type']}")
+            lines.append(f"\n{i}. {account['service']}")
+            lines.append(f"   📧 Email: {account['email']}")
+            lines.append(f"   🔑 Password: {account['password']}")
+            lines.append(f"   🔗 Website: {account['official_website']}")
+            lines.append(f"   📌 Type: {account['type']}")
         
-        print("\n" + "="*60)
+        lines.append("\n" + "="*60)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     async def run(self):
         """Main execution method"""
-        async with async_playwright() as p:
-            print(f"🚀 Starting Oxaam Automation (Headless: {self.headless})...")
-            
-            # Check if already registered in this run
-            users = self.load_registered_users()
-            if users:
-                print(f"\n⚠️  Found {len(users)} already registered user(s)")
-                print("⚠️  ONE REGISTRATION PER RUN - Skipping new registration")
-                print("⚠️  Delete 'oxaam_registered_users.json' to register a new account")
+        logger.info(f"🚀 Starting Oxaam Automation (Headless: {self.headless})...")
+        
+        # Check if already registered in this run
+        if self._registered_emails:
+            logger.warning(f"\n⚠️  Found {len(self._registered_emails)} already registered user(s)")
+            logger.warning("⚠️  ONE REGISTRATION PER RUN - Skipping new registration")
+            logger.warning(f"⚠️  Delete '{self.registered_users_file}' (and '{self.legacy_registered_users_file}', if present) to register a new account")
+            _flush_logs()
+            return
+        
+        # Reuse the warm shared browser; only the context is per run
+        browser = await get_browser(self.headless)
+        
+        context = await browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        )
+        
+        try:
+            # Only the HTML matters, so don't download images, fonts, CSS or media
+            await context.route("**/*", _block_heavy_resources)
+            
+            page = await context.new_page()
+            
+            # Step 1: Register new account
+            if not await self.register_account(page):
+                logger.error("❌ Registration failed or skipped")
                 return
             
-            # Launch browser with enhanced settings
-            browser = await p.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage'
-                ]
-            )
+            # Step 2: Navigate to free services
+            if not await self.browse_free_services(page):
+                logger.warning("⚠️  Could not navigate to free services")
+                return
             
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
+            # Step 3: Extract all accounts from HTML
+            await self.extract_all_accounts(page)
             
-            page = await context.new_page()
+            # Print summary
+            self.print_summary()
             
-            try:
-                # Step 1: Register new account
-                if not await self.register_account(page):
-                    print("❌ Registration failed or skipped")
-                    return
-                
-                # Step 2: Navigate to free services
-                if not await self.browse_free_services(page):
-                    print("⚠️  Could not navigate to free services")
-                    return
-                
-                # Step 3: Extract all accounts from HTML
-                await self.extract_all_accounts(page)
-                
-                # Print summary
-                self.print_summary()
-                
-                # Save to file
-                self.save_to_file()
-                
-                # Wait before closing
-                if not self.headless:
-                    print("\n⏳ Waiting 5 seconds before closing...")
-                    await page.wait_for_timeout(5000)
-                
-            except Exception as e:
-                print(f"\n❌ Error during automation: {str(e)}")
-                import traceback
-                traceback.print_exc()
-            
-            finally:
-                await browser.close()
-                print("\n✅ Automation completed!")
+            # Save to file
+            self.save_to_file()
+            
+            # Wait before closing
+            if not self.headless:
+                logger.info("\n⏳ Waiting 5 seconds before closing...")
+                await page.wait_for_timeout(5000)
+            
+        except Exception as e:
+            logger.error(f"\n❌ Error during automation: {e!r}", exc_info=self.debug)
+        
+        finally:
+            # Close only this run's context; the browser stays up for the next run
+            await context.close()
+            logger.info("\n✅ Automation completed!")
+            _flush_logs()
 
 # Main execution
 async def main():
+    # Buffer progress messages and write them to stderr in batches rather than
+    # one write per line; errors and run() flush the buffer
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(logging.handlers.MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=stream))
+    logger.setLevel(logging.INFO)
+    
     # Create automation instance (headless=True for background operation)
     automation = OxaamAutomation(headless=True, save_results=True)
     
-    # Run automation
-    await automation.run()
+    # Run automation, then shut down the shared browser and HTTP session since nothing else will use them
+    try:
+        await automation.run()
+    finally:
+        await close_browser()
+        await close_http_session()
     
     # Display specific account info
     if automation.free_accounts:
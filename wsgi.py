@@ -0,0 +1,4 @@
+# WSGI entrypoint for gunicorn
+from app import app
+
+application = app